@@ -0,0 +1,69 @@
+"""
+A local cache of previously computed checksums, keyed by (bucket, key, ETag).
+
+Deciding whether an object can be skipped normally costs one S3 round trip
+per object (GetObjectTagging), which is what dominates re-runs over mostly
+unchanged buckets.  Remembering checksums locally lets a re-run skip any
+object whose ETag is unchanged without making any API call for it at all --
+the ETag changes whenever the content does, so a hit is always safe.
+
+"""
+
+import json
+import sqlite3
+import threading
+
+
+class ChecksumCache:
+    """Stores checksums per (bucket, key), validated by ETag.
+
+    SQLite connections can't be shared between threads, so each worker
+    thread lazily opens its own connection to the same database file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS checksums ("
+            "bucket TEXT, key TEXT, etag TEXT, version_id TEXT, tags TEXT, "
+            "PRIMARY KEY (bucket, key))"
+        )
+        conn.commit()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            # WAL mode lets readers proceed while another thread writes.
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, bucket, key, etag):
+        """Look up an object; returns (version_id, tags) or None on a miss.
+
+        An entry whose ETag doesn't match is treated as a miss, since the
+        object's content has changed since the checksums were recorded.
+        """
+        row = self._connection().execute(
+            "SELECT version_id, tags FROM checksums "
+            "WHERE bucket=? AND key=? AND etag=?",
+            (bucket, key, etag),
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return row[0], json.loads(row[1])
+
+    def put(self, bucket, key, etag, version_id, tags):
+        """Record the checksums for the current version of an object."""
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO checksums VALUES (?, ?, ?, ?, ?)",
+            (bucket, key, etag, version_id, json.dumps(tags)),
+        )
+        conn.commit()
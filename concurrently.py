@@ -25,7 +25,12 @@ def concurrently(fn, inputs, *, max_concurrency=5):
     # getting the first element repeatedly.
     fn_inputs = iter(inputs)
 
-    with concurrent.futures.ThreadPoolExecutor() as executor:
+    # Size the pool to the requested concurrency: the default cap
+    # (min(32, cpu_count + 4)) would silently limit higher values, and
+    # lower values would leave idle threads sitting on ~1MB stacks each.
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_concurrency
+    ) as executor:
         futures = {
             executor.submit(fn, input): input
             for input in itertools.islice(fn_inputs, max_concurrency)
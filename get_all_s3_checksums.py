@@ -7,25 +7,37 @@ across all S3 buckets in your AWS account. You can filter buckets by
 name pattern and limit object processing.
 
 Usage:
-    get_all_s3_checksums.py [--checksums=<CHECKSUMS>] [--concurrency=<CONCURRENCY>] [--bucket-filter=<FILTER>] [--max-objects=<MAX>] [--skip-empty] [--force] [--parallel-buckets=<PARALLEL>]
+    get_all_s3_checksums.py [--checksums=<CHECKSUMS>] [--concurrency=<CONCURRENCY>] [--bucket-filter=<FILTER>] [--max-objects=<MAX>] [--skip-empty] [--cache=<PATH>] [--force] [--parallel-buckets=<PARALLEL>] [--list-shards=<SHARDS>]
     get_all_s3_checksums.py (-h | --help)
 
 Options:
     -h --help                    Show this screen.
     --checksums=<CHECKSUMS>      Comma-separated list of checksums to fetch.
-                                 [default: md5,sha1,sha256,sha512]
+                                 [default: sha256,blake2b]
     --concurrency=<CONCURRENCY>  Max number of objects to fetch from S3 at once per bucket.
                                  [default: 5]
-    --bucket-filter=<FILTER>     Only process buckets matching this pattern (supports wildcards).
+    --bucket-filter=<FILTER>     Only process buckets matching these comma-separated
+                                 patterns (supports wildcards).
     --max-objects=<MAX>          Maximum number of objects to process per bucket.
     --skip-empty                 Skip buckets with no objects.
+    --cache=<PATH>               Local SQLite cache of computed checksums, so
+                                 re-runs skip unchanged objects without any
+                                 per-object API calls.
+                                 [default: checksums_cache.sqlite]
     --force                      Force recalculation even if tags already exist.
     --parallel-buckets=<PARALLEL> Number of buckets to process in parallel.
                                  [default: 1]
+    --list-shards=<SHARDS>       List each bucket's top-level prefixes with
+                                 this many parallel listing threads.
+                                 [default: 1]
 """
 
+import base64
+import concurrent.futures
 import csv
+import functools
 import hashlib
+import queue
 import secrets
 import sys
 import os
@@ -33,50 +45,335 @@ import tempfile
 import shutil
 import urllib.parse
 import fnmatch
+import re
 import time
 import threading
 from datetime import datetime
-from collections import defaultdict
 
 import boto3
 import docopt
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from tqdm import tqdm
 
+from checksum_cache import ChecksumCache
 from concurrently import concurrently
 
+# How many bytes to read from S3 per loop iteration.  Large chunks keep the
+# Python-level overhead per byte low and let OpenSSL's vectorised hash code
+# run over big contiguous buffers.
+READ_SIZE = 1 << 20
+
+# Objects at least this big are fetched with parallel ranged GETs rather
+# than a single streaming read, which is capped by one connection's
+# throughput.
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_THRESHOLD,
+    multipart_chunksize=MULTIPART_THRESHOLD,
+    max_concurrency=8,
+)
+
+# Direct constructors bind straight to the OpenSSL implementation, skipping
+# the string-based lookup that hashlib.new() does on every call.
+_HASH_CTORS = {
+    "md5": hashlib.md5,
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "sha512": hashlib.sha512,
+    "blake2b": hashlib.blake2b,
+    "blake2s": hashlib.blake2s,
+}
+
+# BLAKE3 is considerably faster than the SHA-2 family, but it's not in
+# hashlib, so only offer it when the third-party module is installed.
+try:
+    import blake3
+
+    _HASH_CTORS["blake3"] = blake3.blake3
+except ImportError:
+    pass
+
+
+def _new_hash(name):
+    """Create a hasher, preferring the direct constructor where we have one."""
+    try:
+        return _HASH_CTORS[name]()
+    except KeyError:
+        return hashlib.new(name)
+
+
+# Pre-initialised hashers, copied rather than constructed for every object.
+# Copying one is a C-level memcpy of the hash state, which is cheaper than
+# running the constructor and init logic each time.  The templates live in
+# a threading.local so every worker thread copies from its own set, rather
+# than all threads contending on one shared hasher.
+_template_algorithms = []
+_template_local = threading.local()
+
+
+def init_hash_templates(checksums):
+    """Record the requested algorithms; call once at startup."""
+    _template_algorithms[:] = checksums
+
+
+def _templates():
+    templates = getattr(_template_local, "templates", None)
+    if templates is None:
+        templates = {name: _new_hash(name) for name in _template_algorithms}
+        _template_local.templates = templates
+    return templates
+
+
+def _new_hashes(checksums):
+    """Create fresh hashers for one object, copying templates if available."""
+    templates = _templates()
+    return {
+        name: (
+            templates[name].copy() if name in templates else _new_hash(name)
+        )
+        for name in checksums
+    }
+
+
+def _specialize_update(updates):
+    """Generate a fan-out function specialised to this exact hasher set.
+
+    The generated body is a flat sequence of calls bound to the hashers'
+    update methods -- no list iteration per chunk.  The shape is fixed
+    for a whole run, so the tiny one-off exec() pays for itself across
+    millions of chunks.
+    """
+    names = [f"u{i}" for i in range(len(updates))]
+    src = "def _make({params}):\n    def _update(chunk):\n{body}    return _update\n".format(
+        params=", ".join(names),
+        body="".join(f"        {name}(chunk)\n" for name in names),
+    )
+    namespace = {}
+    exec(src, namespace)
+    return namespace["_make"](*updates)
+
+
+class _MultiHasher:
+    """A digest-like object that fans each chunk out to every hasher.
+
+    Having a single ``update`` entry point means ``hashlib.file_digest``
+    can drive all the requested hashers from its C-level read loop.  When
+    more than one hasher is in play, updates run on a small thread pool --
+    hashlib releases the GIL for updates on large buffers, so the digests
+    compute in parallel.
+    """
+
+    def __init__(self, hashes):
+        # Bind the update methods once, rather than doing an attribute
+        # lookup per hasher on every chunk.
+        self._updates = [hv.update for hv in hashes.values()]
+        if len(self._updates) > 1:
+            self._pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=len(self._updates)
+            )
+        else:
+            self._pool = None
+            # Serial updates skip the generic dispatch below entirely in
+            # favour of a call sequence generated for this hasher set.
+            self.update = _specialize_update(self._updates)
+
+    def update(self, data):
+        if self._pool is not None:
+            mv = memoryview(data)
+            list(self._pool.map(lambda update: update(mv), self._updates))
+        else:
+            for update in self._updates:
+                update(data)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+
+
+def _file_digest(body, hasher):
+    """Feed everything in ``body`` to ``hasher.update``."""
+    # file_digest (Python 3.11+) runs the whole read loop in C, using
+    # readinto on a preallocated buffer -- no per-chunk Python dispatch.
+    if hasattr(hashlib, "file_digest"):
+        try:
+            hashlib.file_digest(body, lambda: hasher)
+            return
+        except (TypeError, ValueError):
+            pass  # file_digest refused the body; stream it by hand
+
+    # Prefer readinto with one preallocated buffer: each chunk lands in
+    # the same bytearray instead of allocating a fresh bytes object.
+    readinto = getattr(body, "readinto", None)
+    if readinto is not None:
+        buf = bytearray(READ_SIZE)
+        view = memoryview(buf)
+        while n := readinto(buf):
+            hasher.update(view[:n])
+        return
+
+    while chunk := body.read(READ_SIZE):
+        hasher.update(chunk)
+
+
+def _hash_body(body, hashes):
+    """Feed a streaming S3 body through every requested hasher."""
+    # A single requested checksum is the common case, and it can go
+    # straight into the C read loop with no multi-hash machinery at all.
+    if len(hashes) == 1:
+        (hv,) = hashes.values()
+        _file_digest(body, hv)
+        return
+
+    multihasher = _MultiHasher(hashes)
+    try:
+        _file_digest(body, multihasher)
+    finally:
+        multihasher.close()
+
+
+class _HashingSink:
+    """A write-only file-like object that hashes everything written to it."""
+
+    def __init__(self, multihasher):
+        self._multihasher = multihasher
+        self._lock = threading.Lock()
+
+    def write(self, data):
+        # For a non-seekable sink, download_fileobj delivers the chunks in
+        # order; the lock just serialises writes from its worker threads.
+        with self._lock:
+            self._multihasher.update(data)
+        return len(data)
+
+
+def _download_and_hash(s3, bucket, key, hashes):
+    """Hash a large object by downloading it with parallel ranged GETs."""
+    multihasher = _MultiHasher(hashes)
+    try:
+        s3.download_fileobj(
+            Bucket=bucket,
+            Key=key,
+            Fileobj=_HashingSink(multihasher),
+            Config=_TRANSFER_CONFIG,
+        )
+    finally:
+        multihasher.close()
+
+
+# boto3's default pool is 10 connections per client, so any concurrency
+# above that just queues inside urllib3.  main() resizes this once the
+# CLI's concurrency is known, before any client is built.
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+_max_pool_connections = DEFAULT_MAX_POOL_CONNECTIONS
+
+
+def configure_connection_pool(size):
+    """Size the shared HTTP connection pool; call before any S3 traffic."""
+    global _max_pool_connections
+    _max_pool_connections = max(DEFAULT_MAX_POOL_CONNECTIONS, size)
+    _s3_client.cache_clear()
+
+
+@functools.lru_cache(maxsize=None)
+def _s3_client(sess, region=None):
+    """Return a shared S3 client for this session/region.
+
+    Clients are safe to share between threads, and building one per object
+    is surprisingly expensive (it re-parses botocore's endpoint data), so
+    all the workers use this small cached pool instead.
+    """
+    config = Config(
+        max_pool_connections=_max_pool_connections,
+        # Keep connections warm between requests, and let botocore's
+        # client-side rate limiter back off if S3 starts sending 503s.
+        tcp_keepalive=True,
+        retries={"mode": "adaptive", "max_attempts": 10},
+    )
+    return sess.client("s3", region_name=region, config=config)
+
+
+# Checksums S3 can compute itself at upload time.  HeadObject returns
+# them as base64 in these response fields, without any body transfer.
+_S3_NATIVE_CHECKSUMS = {
+    "crc32": "ChecksumCRC32",
+    "crc32c": "ChecksumCRC32C",
+    "sha1": "ChecksumSHA1",
+    "sha256": "ChecksumSHA256",
+}
+
+
+def _native_checksums(s3, bucket, key, checksums):
+    """Fetch S3-computed checksums for an object, without downloading it.
+
+    Returns ``(found, head_response)``, where ``found`` maps algorithm
+    name to hex digest for every requested algorithm S3 already knows.
+    Multipart uploads carry composite "checksum-N" values, which aren't
+    digests of the whole object, so those are ignored.
+    """
+    wanted = [name for name in checksums if name in _S3_NATIVE_CHECKSUMS]
+    if not wanted:
+        return {}, None
+
+    try:
+        head = s3.head_object(Bucket=bucket, Key=key, ChecksumMode="ENABLED")
+    except ClientError:
+        return {}, None
+
+    found = {}
+    for name in wanted:
+        value = head.get(_S3_NATIVE_CHECKSUMS[name])
+        if value and "-" not in value:
+            found[name] = base64.b64decode(value).hex()
+
+    return found, head
+
 
 class PerformanceTracker:
-    """Track performance metrics across all bucket processing."""
+    """Track performance metrics across all bucket processing.
+
+    Counts accumulate lock-free in a per-thread stripe and are folded
+    into the shared totals when the thread's bucket completes, so the
+    hot update path never contends on the lock.  Mid-run snapshots from
+    get_stats() therefore lag by whatever the in-flight buckets haven't
+    flushed yet, which is fine for progress reporting.
+    """
     def __init__(self, total_buckets):
         self.lock = threading.Lock()
         self.start_time = time.time()
         self.total_buckets = total_buckets
         self.completed_buckets = 0
-        self.bucket_metrics = defaultdict(lambda: {
-            'objects': 0, 'skipped': 0, 'bytes': 0, 'start_time': None, 'end_time': None
-        })
         self.total_objects = 0
         self.total_skipped = 0
         self.total_bytes = 0
-    
+        self._stripes = threading.local()
+
+    def _stripe(self):
+        counts = getattr(self._stripes, 'counts', None)
+        if counts is None:
+            counts = {'objects': 0, 'skipped': 0, 'bytes': 0}
+            self._stripes.counts = counts
+        return counts
+
     def start_bucket(self, bucket_name):
-        with self.lock:
-            self.bucket_metrics[bucket_name]['start_time'] = time.time()
-    
+        pass
+
     def update_bucket(self, bucket_name, objects=0, skipped=0, bytes_processed=0):
-        with self.lock:
-            self.bucket_metrics[bucket_name]['objects'] += objects
-            self.bucket_metrics[bucket_name]['skipped'] += skipped
-            self.bucket_metrics[bucket_name]['bytes'] += bytes_processed
-            self.total_objects += objects
-            self.total_skipped += skipped
-            self.total_bytes += bytes_processed
-    
+        counts = self._stripe()
+        counts['objects'] += objects
+        counts['skipped'] += skipped
+        counts['bytes'] += bytes_processed
+
     def complete_bucket(self, bucket_name):
+        counts = self._stripe()
         with self.lock:
-            self.bucket_metrics[bucket_name]['end_time'] = time.time()
+            self.total_objects += counts['objects']
+            self.total_skipped += counts['skipped']
+            self.total_bytes += counts['bytes']
             self.completed_buckets += 1
+        counts['objects'] = counts['skipped'] = counts['bytes'] = 0
     
     def get_stats(self):
         with self.lock:
@@ -121,7 +418,7 @@ class PerformanceTracker:
 
 def list_all_buckets(sess):
     """List all S3 buckets in the account."""
-    s3 = sess.client('s3')
+    s3 = _s3_client(sess)
     try:
         response = s3.list_buckets()
         return [(bucket['Name'], bucket['CreationDate']) for bucket in response['Buckets']]
@@ -130,9 +427,30 @@ def list_all_buckets(sess):
         return []
 
 
+@functools.lru_cache(maxsize=None)
 def get_bucket_region(sess, bucket_name):
-    """Get the region of a bucket."""
-    s3 = sess.client('s3')
+    """Get the region of a bucket.
+
+    The result is cached, since both the listing and counting paths ask
+    for the same bucket's region.
+    """
+    s3 = _s3_client(sess)
+
+    # head_bucket reports the region in a response header, needs no extra
+    # permission beyond ListBucket, and answers even when the bucket is in
+    # another region (the redirect error still carries the header).
+    try:
+        response = s3.head_bucket(Bucket=bucket_name)
+        headers = response["ResponseMetadata"]["HTTPHeaders"]
+        if "x-amz-bucket-region" in headers:
+            return headers["x-amz-bucket-region"]
+    except ClientError as e:
+        headers = e.response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+        if "x-amz-bucket-region" in headers:
+            return headers["x-amz-bucket-region"]
+
+    # Fall back to the dedicated API, for S3-compatible endpoints that
+    # don't set the header.
     try:
         response = s3.get_bucket_location(Bucket=bucket_name)
         region = response.get('LocationConstraint')
@@ -149,14 +467,23 @@ def list_s3_objects(sess, *, bucket, prefix="", max_objects=None):
         print(f"Warning: Could not determine region for bucket {bucket}, skipping", file=sys.stderr)
         return
     
-    client = sess.client("s3", region_name=region)
+    client = _s3_client(sess, region)
     paginator = client.get_paginator("list_objects_v2")
     
     count = 0
     try:
         for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
             for s3_obj in page.get("Contents", []):
-                yield {"bucket": bucket, "key": s3_obj["Key"], "region": region}
+                # Pass the metadata we already have along, so the per-object
+                # worker doesn't need a head_object call to rediscover it.
+                yield {
+                    "bucket": bucket,
+                    "key": s3_obj["Key"],
+                    "region": region,
+                    "size": s3_obj["Size"],
+                    "etag": s3_obj["ETag"],
+                    "last_modified": s3_obj["LastModified"],
+                }
                 count += 1
                 if max_objects and count >= max_objects:
                     return
@@ -164,100 +491,274 @@ def list_s3_objects(sess, *, bucket, prefix="", max_objects=None):
         print(f"Warning: Error listing objects in {bucket}: {e}", file=sys.stderr)
 
 
+def list_s3_objects_sharded(sess, *, bucket, shards):
+    """List a bucket by paginating top-level prefixes in parallel.
+
+    A single list_objects_v2 paginator returns at most 1,000 keys per
+    round trip, so enumerating a large bucket is latency-bound.  This
+    makes one delimited pass over the bucket root to find the top-level
+    "directories", then paginates each one on a thread pool, funnelling
+    rows through a bounded queue.  Objects arrive grouped by prefix
+    rather than in overall alphabetical order, which the spreadsheet
+    already tolerates (concurrent hashing reorders rows anyway).
+    """
+    region = get_bucket_region(sess, bucket)
+    if not region:
+        print(f"Warning: Could not determine region for bucket {bucket}, skipping", file=sys.stderr)
+        return
+
+    client = _s3_client(sess, region)
+    paginator = client.get_paginator("list_objects_v2")
+
+    def _row(s3_obj):
+        return {
+            "bucket": bucket,
+            "key": s3_obj["Key"],
+            "region": region,
+            "size": s3_obj["Size"],
+            "etag": s3_obj["ETag"],
+            "last_modified": s3_obj["LastModified"],
+        }
+
+    # Discovery pass: objects at the bucket root are yielded directly,
+    # and every CommonPrefix becomes a shard.
+    prefixes = []
+    try:
+        for page in paginator.paginate(Bucket=bucket, Delimiter="/"):
+            for s3_obj in page.get("Contents", []):
+                yield _row(s3_obj)
+            prefixes.extend(p["Prefix"] for p in page.get("CommonPrefixes", []))
+    except ClientError as e:
+        print(f"Warning: Error listing objects in {bucket}: {e}", file=sys.stderr)
+        return
+
+    if not prefixes:
+        return
+
+    results = queue.Queue(maxsize=10_000)
+    stop_listing = threading.Event()
+
+    def _put(item):
+        # A plain blocking put would wedge executor shutdown if the
+        # consumer abandons this generator early, so poll a stop flag.
+        while not stop_listing.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _list_prefix(prefix):
+        try:
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+                if stop_listing.is_set():
+                    return
+                for s3_obj in page.get("Contents", []):
+                    _put(_row(s3_obj))
+        except ClientError as e:
+            print(f"Warning: Error listing objects in {bucket}/{prefix}: {e}", file=sys.stderr)
+        finally:
+            # One sentinel per prefix tells the consumer when to stop.
+            _put(None)
+
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(shards, len(prefixes))
+    )
+    try:
+        for prefix in prefixes:
+            executor.submit(_list_prefix, prefix)
+
+        remaining = len(prefixes)
+        while remaining:
+            item = results.get()
+            if item is None:
+                remaining -= 1
+            else:
+                yield item
+    finally:
+        stop_listing.set()
+        executor.shutdown(wait=True)
+
+
 def check_existing_tags(s3, bucket, key, required_checksums):
     """Check if object already has all required checksum tags."""
     try:
         response = s3.get_object_tagging(Bucket=bucket, Key=key)
         existing_tags = {tag['Key']: tag['Value'] for tag in response.get('TagSet', [])}
-        
+        version_id = response.get("VersionId", "")
+
         # Check if all required checksums exist as tags
         for checksum in required_checksums:
             if checksum not in existing_tags:
-                return False, existing_tags
-        
-        return True, existing_tags
+                return False, existing_tags, version_id
+
+        return True, existing_tags, version_id
     except ClientError:
-        return False, {}
+        return False, {}, ""
 
 
-def get_s3_object_checksums(sess, *, bucket, key, region, checksums, force=False):
+def get_s3_object_checksums(
+    sess, *, bucket, key, region, checksums, size=None, etag=None,
+    last_modified=None, cache=None, force=False
+):
     """Get checksums for an S3 object and set tags."""
-    s3 = sess.client("s3", region_name=region)
-    
+    s3 = _s3_client(sess, region)
+
+    # A cache hit means we've already hashed this exact content (the ETag
+    # changes whenever the content does), so the row can be built without
+    # any API calls at all.
+    if not force and cache is not None and etag is not None:
+        cached = cache.get(bucket, key, etag)
+        if cached is not None:
+            version_id, cached_tags = cached
+            if all(name in cached_tags for name in checksums):
+                result = {
+                    "bucket": bucket,
+                    "key": key,
+                    "size": size,
+                    "ETag": etag,
+                    "VersionId": version_id,
+                    "last_modified": int(last_modified.timestamp()) if last_modified else "",
+                    "skipped": True  # Mark that we skipped calculation
+                }
+
+                for name in checksums:
+                    result[f"checksum.{name}"] = cached_tags[name]
+
+                return result
+
     # Check if we should skip this object
     if not force:
-        has_all_tags, existing_tags = check_existing_tags(s3, bucket, key, checksums)
+        has_all_tags, existing_tags, version_id = check_existing_tags(
+            s3, bucket, key, checksums
+        )
         if has_all_tags:
-            # Object already has all required tags, return them without recalculating
-            try:
-                s3_obj = s3.head_object(Bucket=bucket, Key=key)
+            # The listing already told us the size/ETag/last-modified, so
+            # we only head the object if that metadata wasn't passed in.
+            if size is None or etag is None or last_modified is None:
+                try:
+                    s3_obj = s3.head_object(Bucket=bucket, Key=key)
+                    size = s3_obj["ContentLength"]
+                    etag = s3_obj["ETag"]
+                    last_modified = s3_obj["LastModified"]
+                    version_id = s3_obj.get("VersionId", version_id)
+                except ClientError:
+                    pass  # Fall through to calculate checksums
+
+            if size is not None and etag is not None and last_modified is not None:
                 result = {
                     "bucket": bucket,
                     "key": key,
-                    "size": s3_obj["ContentLength"],
-                    "ETag": s3_obj["ETag"],
-                    "VersionId": s3_obj.get("VersionId", ""),
-                    "last_modified": s3_obj["LastModified"].isoformat(),
+                    "size": size,
+                    "ETag": etag,
+                    "VersionId": version_id,
+                    "last_modified": int(last_modified.timestamp()),
                     "skipped": True  # Mark that we skipped calculation
                 }
-                
+
                 # Add existing checksums from tags
                 for name in checksums:
                     result[f"checksum.{name}"] = existing_tags.get(name, "")
-                
+
+                # Remember the tags locally, so the next run skips this
+                # object without even the GetObjectTagging round trip.
+                if cache is not None:
+                    cache.put(bucket, key, etag, version_id, existing_tags)
+
                 return result
-            except ClientError:
-                pass  # Fall through to calculate checksums
-    
+
     # Calculate checksums
-    hashes = {name: hashlib.new(name) for name in checksums}
-    
-    try:
-        s3_obj = s3.get_object(Bucket=bucket, Key=key)
-    except ClientError as e:
-        print(f"Warning: Error getting object {bucket}/{key}: {e}", file=sys.stderr)
-        return None
+    hashes = _new_hashes(checksums)
 
-    while chunk := s3_obj["Body"].read(8192):
-        for hv in hashes.values():
-            hv.update(chunk)
-
-    result = {
-        "bucket": bucket,
-        "key": key,
-        "size": s3_obj["ContentLength"],
-        "ETag": s3_obj["ETag"],
-        "VersionId": s3_obj.get("VersionId", ""),
-        "last_modified": s3_obj["LastModified"].isoformat(),
-        "skipped": False
-    }
+    # Two shortcuts need no download: a zero-byte object has the well-known
+    # empty digest for every algorithm, and for single-part uploads (no "-"
+    # in the ETag) the ETag is the object's MD5.
+    known = {}
+    if size == 0:
+        known = {name: hv.hexdigest() for name, hv in hashes.items()}
+        hashes = {}
+    elif "md5" in hashes and etag is not None and "-" not in etag:
+        known["md5"] = etag.strip('"')
+        del hashes["md5"]
+
+    # If S3 computed any of the requested checksums at upload time, trust
+    # those and only download the body for whatever is still missing.
+    native, head = _native_checksums(s3, bucket, key, list(hashes))
+    for name in native:
+        hashes.pop(name, None)
+
+    if hashes:
+        try:
+            s3_obj = s3.get_object(Bucket=bucket, Key=key)
+        except ClientError as e:
+            print(f"Warning: Error getting object {bucket}/{key}: {e}", file=sys.stderr)
+            return None
+
+        try:
+            if s3_obj["ContentLength"] >= MULTIPART_THRESHOLD:
+                s3_obj["Body"].close()
+                _download_and_hash(s3, bucket, key, hashes)
+            else:
+                _hash_body(s3_obj["Body"], hashes)
+        except ClientError as e:
+            print(f"Warning: Error reading object {bucket}/{key}: {e}", file=sys.stderr)
+            return None
+    elif head is not None:
+        # Every remaining checksum was already known to S3, so the HEAD
+        # we just made supplies the metadata and no GET happens at all.
+        s3_obj = head
+    elif size is not None and etag is not None and last_modified is not None:
+        # The shortcuts covered everything and the listing already gave
+        # us the metadata: no per-object request at all.
+        s3_obj = None
+    else:
+        try:
+            s3_obj = s3.head_object(Bucket=bucket, Key=key)
+        except ClientError as e:
+            print(f"Warning: Error heading object {bucket}/{key}: {e}", file=sys.stderr)
+            return None
+
+    if s3_obj is not None:
+        result = {
+            "bucket": bucket,
+            "key": key,
+            "size": s3_obj["ContentLength"],
+            "ETag": s3_obj["ETag"],
+            "VersionId": s3_obj.get("VersionId", ""),
+            "last_modified": int(s3_obj["LastModified"].timestamp()),
+            "skipped": False
+        }
+    else:
+        result = {
+            "bucket": bucket,
+            "key": key,
+            "size": size,
+            "ETag": etag,
+            "VersionId": "",
+            "last_modified": int(last_modified.timestamp()),
+            "skipped": False
+        }
 
     # Calculate checksums and prepare tags
-    tags = {}
+    tags = dict(native)
+    tags.update(known)
     for name, hv in hashes.items():
-        checksum_value = hv.hexdigest()
-        result[f"checksum.{name}"] = checksum_value
-        tags[name] = checksum_value
+        tags[name] = hv.digest().hex()
+    for name in checksums:
+        result[f"checksum.{name}"] = tags[name]
 
-    # Set tags on the S3 object
-    try:
-        tag_set = [{"Key": k, "Value": v} for k, v in tags.items()]
-        s3.put_object_tagging(
-            Bucket=bucket,
-            Key=key,
-            Tagging={"TagSet": tag_set}
-        )
-        if s3_obj.get("VersionId"):
-            # If versioning is enabled, tag the specific version
-            s3.put_object_tagging(
-                Bucket=bucket,
-                Key=key,
-                VersionId=s3_obj["VersionId"],
-                Tagging={"TagSet": tag_set}
-            )
-    except Exception as e:
-        # Log the error but don't fail the checksum calculation
-        print(f"Warning: Failed to set tags for {bucket}/{key}: {e}", file=sys.stderr)
+    # Set tags on the S3 object, in the background
+    tag_set = [{"Key": k, "Value": v} for k, v in tags.items()]
+    params = {"Bucket": bucket, "Key": key, "Tagging": {"TagSet": tag_set}}
+    if result["VersionId"]:
+        # The version we just read is the current one, so a single
+        # call with VersionId covers it -- tagging without a version
+        # and then again with one just tagged the same version twice.
+        params["VersionId"] = result["VersionId"]
+    _tag_writer_pool().submit(_put_tags, s3, params, bucket, key)
+
+    if cache is not None:
+        cache.put(bucket, key, result["ETag"], result["VersionId"], tags)
 
     return result
 
@@ -269,14 +770,74 @@ def count_bucket_objects(sess, bucket):
         return 0
     
     try:
-        s3 = sess.client('s3', region_name=region)
+        s3 = _s3_client(sess, region)
         response = s3.list_objects_v2(Bucket=bucket, MaxKeys=1)
         return response.get('KeyCount', 0)
     except ClientError:
         return 0
 
 
-def process_bucket(bucket_info, sess, checksums, max_objects, max_concurrency, force, fieldnames, tracker, temp_dir, position, parallel_buckets=1):
+# Tag writes never affect the spreadsheet row, so they go through a small
+# dedicated pool: the worker moves on to its next GetObject while the
+# PutObjectTagging round trip completes in the background.
+_tag_writer = None
+_tag_writer_lock = threading.Lock()
+
+
+def _tag_writer_pool():
+    global _tag_writer
+    with _tag_writer_lock:
+        if _tag_writer is None:
+            _tag_writer = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        return _tag_writer
+
+
+def _put_tags(s3, params, bucket, key):
+    try:
+        s3.put_object_tagging(**params)
+    except Exception as e:
+        # Log the error but don't fail the checksum calculation
+        print(f"Warning: Failed to set tags for {bucket}/{key}: {e}", file=sys.stderr)
+
+
+def flush_tag_writes():
+    """Wait for any queued tag writes; call after all objects are done."""
+    global _tag_writer
+    with _tag_writer_lock:
+        pool, _tag_writer = _tag_writer, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def _drain_rows(row_queue, writer):
+    """Write queued rows to the spreadsheet, in batches.
+
+    This runs on a thread of its own, so CSV formatting and disk flushes
+    never stall the loop that's feeding the S3 workers.  A ``None`` on the
+    queue ends the stream.
+    """
+    done = False
+    while not done:
+        rows = [row_queue.get()]
+        if rows[0] is None:
+            break
+
+        # Batch up whatever else is already waiting, to amortise the
+        # per-call overhead of writerows().
+        try:
+            while len(rows) < 1024:
+                row = row_queue.get_nowait()
+                if row is None:
+                    done = True
+                    break
+                rows.append(row)
+        except queue.Empty:
+            pass
+
+        writer.writerows(rows)
+
+
+def process_bucket(bucket_info, sess, checksums, max_objects, max_concurrency, force, fieldnames, tracker, temp_dir, position, parallel_buckets=1, cache=None, list_shards=1):
     """Process a single bucket and write results to a temporary CSV file."""
     bucket_name, created_date = bucket_info
     
@@ -327,44 +888,68 @@ def process_bucket(bucket_info, sess, checksums, max_objects, max_concurrency, f
     
     try:
         with open(temp_file, 'w') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            # A plain writer with positional rows avoids DictWriter's per-row
+            # field-order lookups.
+            writer = csv.writer(f)
             # Don't write header in temp files, we'll add it to the final file
-            
-            for _, output in concurrently(
-                lambda s3_obj: get_s3_object_checksums(sess, **s3_obj, checksums=checksums, force=force),
-                list_s3_objects(sess, bucket=bucket_name, max_objects=max_objects),
-                max_concurrency=max_concurrency
-            ):
-                if output:  # Skip None results from errors
-                    # Don't write the 'skipped' field to CSV
-                    skipped = output.pop('skipped', False)
-                    size = output.get('size', 0)
-                    
-                    writer.writerow(output)
-                    
-                    bucket_objects += 1
-                    bucket_bytes += size
-                    
-                    if skipped:
-                        bucket_skipped += 1
-                        pbar.set_postfix({'skipped': bucket_skipped})
-                        # Update description with skipped count
-                        pbar.set_description(f"{bucket_name[:30]:30} (S:{bucket_skipped})")
-                    
-                    # Update progress bar
-                    pbar.update(1)
-                    
-                    # Update tracker for overall stats
-                    if bucket_objects % 10 == 0:
-                        tracker.update_bucket(bucket_name, objects=10, 
-                                            skipped=bucket_skipped if bucket_objects == 10 else 0, 
-                                            bytes_processed=bucket_bytes)
-                        bucket_bytes = 0  # Reset for next batch
-                    
-                    # Print status every 100 objects in parallel mode
-                    if bucket_objects % 100 == 0 and parallel_buckets > 1:
-                        print(f"[Bucket {position+1}] {bucket_name}: {bucket_objects} objects processed ({bucket_skipped} skipped)", file=sys.stderr)
-            
+
+            row_queue = queue.Queue(maxsize=10_000)
+            writer_thread = threading.Thread(
+                target=_drain_rows, args=(row_queue, writer)
+            )
+            writer_thread.start()
+
+            # Sharded listing has no way to stop at an exact object count,
+            # so --max-objects keeps the serial paginator.
+            if list_shards > 1 and max_objects is None:
+                s3_objects = list_s3_objects_sharded(
+                    sess, bucket=bucket_name, shards=list_shards
+                )
+            else:
+                s3_objects = list_s3_objects(
+                    sess, bucket=bucket_name, max_objects=max_objects
+                )
+
+            try:
+                for _, output in concurrently(
+                    lambda s3_obj: get_s3_object_checksums(sess, **s3_obj, checksums=checksums, cache=cache, force=force),
+                    s3_objects,
+                    max_concurrency=max_concurrency
+                ):
+                    if output:  # Skip None results from errors
+                        # Don't write the 'skipped' field to CSV
+                        skipped = output.pop('skipped', False)
+                        size = output.get('size', 0)
+
+                        row_queue.put([output.get(k, "") for k in fieldnames])
+
+                        bucket_objects += 1
+                        bucket_bytes += size
+
+                        if skipped:
+                            bucket_skipped += 1
+                            pbar.set_postfix({'skipped': bucket_skipped})
+                            # Update description with skipped count
+                            pbar.set_description(f"{bucket_name[:30]:30} (S:{bucket_skipped})")
+
+                        # Update progress bar
+                        pbar.update(1)
+
+                        # Update tracker for overall stats
+                        if bucket_objects % 10 == 0:
+                            tracker.update_bucket(bucket_name, objects=10,
+                                                skipped=bucket_skipped if bucket_objects == 10 else 0,
+                                                bytes_processed=bucket_bytes)
+                            bucket_bytes = 0  # Reset for next batch
+
+                        # Print status every 100 objects in parallel mode
+                        if bucket_objects % 100 == 0 and parallel_buckets > 1:
+                            print(f"[Bucket {position+1}] {bucket_name}: {bucket_objects} objects processed ({bucket_skipped} skipped)", file=sys.stderr)
+            finally:
+                row_queue.put(None)
+                writer_thread.join()
+
+
             # Final update for remaining objects
             remaining_objects = bucket_objects % 10
             if remaining_objects > 0 or bucket_objects == 0:
@@ -386,10 +971,44 @@ def process_bucket(bucket_info, sess, checksums, max_objects, max_concurrency, f
             os.remove(temp_file)
         temp_file = None
     
+    # Make sure this bucket's background tag writes have landed before the
+    # bucket is reported complete.
+    flush_tag_writes()
+
     tracker.complete_bucket(bucket_name)
     return temp_file
 
 
+def _process_bucket_task(bucket_info, checksums, max_objects, max_concurrency,
+                         force, fieldnames, temp_dir, position,
+                         parallel_buckets, cache_path, list_shards):
+    """Process one bucket in a worker process.
+
+    boto3 sessions, clients and SQLite connections can't cross a fork, so
+    everything stateful is rebuilt here, and the per-process module state
+    (hash templates, connection pool size) is initialised the same way
+    main() does it.
+    """
+    init_hash_templates(checksums)
+    # Hashing workers, ranged-GET transfer threads, listing shards and
+    # the tag writer all hold connections at once, so give the pool
+    # plenty of headroom.
+    configure_connection_pool(max(128, max_concurrency * 4))
+
+    sess = boto3.Session()
+    cache = ChecksumCache(cache_path)
+
+    # A local tracker collects this bucket's counts; the parent folds them
+    # into its own tracker when the result comes back.
+    tracker = PerformanceTracker(1)
+    temp_file = process_bucket(
+        bucket_info, sess, checksums, max_objects, max_concurrency, force,
+        fieldnames, tracker, temp_dir, position, parallel_buckets, cache,
+        list_shards,
+    )
+    return temp_file, tracker.total_objects, tracker.total_skipped, tracker.total_bytes
+
+
 def main():
     args = docopt.docopt(__doc__)
 
@@ -400,13 +1019,32 @@ def main():
     skip_empty = args["--skip-empty"]
     force = args["--force"]
     parallel_buckets = int(args["--parallel-buckets"])
+    list_shards = int(args["--list-shards"])
 
     for h in checksums:
-        if h not in hashlib.algorithms_available:
+        if h not in _HASH_CTORS and h not in hashlib.algorithms_available:
             sys.exit(f"Unavailable/unrecognised checksum algorithm: {h!r}")
 
+    # Every extra algorithm is another full pass over every byte, and the
+    # legacy digests rarely add anything once a SHA-2 value is recorded.
+    if {"md5", "sha1"} & set(checksums) and {"sha256", "sha512"} & set(checksums):
+        print(
+            "Warning: computing MD5/SHA-1 alongside SHA-2 checksums hashes "
+            "every object once per algorithm; consider a smaller --checksums "
+            "list if you don't need the legacy digests.",
+            file=sys.stderr,
+        )
+
+    init_hash_templates(checksums)
+
+    # Hashing workers, ranged-GET transfer threads, listing shards and
+    # the tag writer all hold connections at once, so give the pool
+    # plenty of headroom.
+    configure_connection_pool(max(128, max_concurrency * 4))
+
     sess = boto3.Session()
-    
+    cache = ChecksumCache(args["--cache"])
+
     # Get all buckets
     print("Listing all S3 buckets in the account...", file=sys.stderr)
     all_buckets = list_all_buckets(sess)
@@ -414,11 +1052,18 @@ def main():
     if not all_buckets:
         sys.exit("No buckets found or unable to list buckets")
     
-    # Filter buckets if requested
+    # Filter buckets if requested.  The comma-separated patterns compile
+    # into a single alternation regex, so every bucket name is tested with
+    # one match call however many patterns were given.
     if bucket_filter:
+        pattern = re.compile(
+            "|".join(
+                fnmatch.translate(p) for p in bucket_filter.split(",") if p
+            )
+        )
         filtered_buckets = [
-            (name, created) for name, created in all_buckets 
-            if fnmatch.fnmatch(name, bucket_filter)
+            (name, created) for name, created in all_buckets
+            if pattern.match(name)
         ]
         print(f"Found {len(filtered_buckets)} buckets matching filter '{bucket_filter}'", file=sys.stderr)
     else:
@@ -428,15 +1073,31 @@ def main():
     if not filtered_buckets:
         sys.exit("No buckets match the specified filter")
     
-    # Check for empty buckets if requested
-    if skip_empty:
-        non_empty_buckets = []
-        for bucket_name, created in filtered_buckets:
-            if count_bucket_objects(sess, bucket_name) > 0:
-                non_empty_buckets.append((bucket_name, created))
-            else:
-                print(f"Skipping empty bucket: {bucket_name}", file=sys.stderr)
-        filtered_buckets = non_empty_buckets
+    # Resolve every bucket's region (and, if requested, whether it's empty)
+    # in one parallel burst.  Each call is a ~50-200ms round trip, so doing
+    # them serially dominates start-up time on accounts with many buckets;
+    # the lookups are cached, so nothing later pays them again.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=32) as executor:
+        if skip_empty:
+            counts = list(
+                executor.map(
+                    lambda b: count_bucket_objects(sess, b[0]), filtered_buckets
+                )
+            )
+            non_empty_buckets = []
+            for (bucket_name, created), count in zip(filtered_buckets, counts):
+                if count > 0:
+                    non_empty_buckets.append((bucket_name, created))
+                else:
+                    print(f"Skipping empty bucket: {bucket_name}", file=sys.stderr)
+            filtered_buckets = non_empty_buckets
+        else:
+            # Just warm the region cache.
+            list(
+                executor.map(
+                    lambda b: get_bucket_region(sess, b[0]), filtered_buckets
+                )
+            )
     
     # Generate output filename
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -459,27 +1120,46 @@ def main():
         print(f"\n🚀 Starting parallel processing with {parallel_buckets} concurrent bucket(s)", file=sys.stderr)
         print(f"📁 Processing {len(filtered_buckets)} buckets total\n", file=sys.stderr)
         
-        # Create a counter for bucket positions
-        position_counter = {'value': 0}
-        position_lock = threading.Lock()
-        
-        # Process buckets in parallel
-        def process_bucket_wrapper(bucket_info):
-            with position_lock:
-                position = position_counter['value']
-                position_counter['value'] += 1
-            
-            return process_bucket(bucket_info, sess, checksums, max_objects, 
-                                max_concurrency, force, fieldnames, tracker, temp_dir, position, parallel_buckets)
-        
-        # Collect temporary files from parallel processing
-        for _, temp_file in concurrently(
-            process_bucket_wrapper,
-            filtered_buckets,
-            max_concurrency=parallel_buckets
-        ):
-            if temp_file:
-                temp_files.append(temp_file)
+        if parallel_buckets > 1:
+            # Worker processes rather than threads: hashing is CPU work,
+            # and while OpenSSL releases the GIL, the Python-level fan-out
+            # (csv rows, progress updates) serialises when several buckets
+            # hash at once.  Each worker rebuilds its own session/cache.
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=parallel_buckets
+            ) as executor:
+                futures = {}
+                for position, bucket_info in enumerate(filtered_buckets):
+                    tracker.start_bucket(bucket_info[0])
+                    fut = executor.submit(
+                        _process_bucket_task, bucket_info, checksums,
+                        max_objects, max_concurrency, force, fieldnames,
+                        temp_dir, position, parallel_buckets,
+                        args["--cache"], list_shards,
+                    )
+                    futures[fut] = bucket_info[0]
+
+                for fut in concurrent.futures.as_completed(futures):
+                    bucket_name = futures[fut]
+                    try:
+                        temp_file, objects, skipped, bytes_processed = fut.result()
+                    except Exception as e:
+                        print(f"Bucket {bucket_name} failed in worker: {e}", file=sys.stderr)
+                        temp_file = None
+                    else:
+                        tracker.update_bucket(
+                            bucket_name, objects=objects, skipped=skipped,
+                            bytes_processed=bytes_processed,
+                        )
+                        if temp_file:
+                            temp_files.append(temp_file)
+                    tracker.complete_bucket(bucket_name)
+        else:
+            for position, bucket_info in enumerate(filtered_buckets):
+                temp_file = process_bucket(bucket_info, sess, checksums, max_objects,
+                                    max_concurrency, force, fieldnames, tracker, temp_dir, position, parallel_buckets, cache, list_shards)
+                if temp_file:
+                    temp_files.append(temp_file)
         
         # Add some spacing after progress bars
         print("\n" * (len(filtered_buckets) + 1), file=sys.stderr)
@@ -488,16 +1168,35 @@ def main():
         print(f"📋 Combining {len(temp_files)} temporary files...", file=sys.stderr)
         
         with open(out_path, "w") as outfile:
-            writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            # Read and combine all temp files
+            # The temp files are headerless and already in the final column
+            # order, so after writing the header the merge is a plain byte
+            # copy -- no point parsing and re-formatting every row.
+            csv.writer(outfile).writerow(fieldnames)
+            # Flush buffered text before handing the descriptor to the
+            # kernel, or the header would land after the copied bytes.
+            outfile.flush()
+
             for temp_file in temp_files:
                 try:
-                    with open(temp_file, 'r') as f:
-                        reader = csv.DictReader(f, fieldnames=fieldnames)
-                        for row in reader:
-                            writer.writerow(row)
+                    with open(temp_file, 'rb') as f:
+                        try:
+                            # sendfile copies file-to-file inside the
+                            # kernel, so the bytes never enter Python.
+                            remaining = os.path.getsize(temp_file)
+                            offset = 0
+                            while remaining:
+                                sent = os.sendfile(
+                                    outfile.fileno(), f.fileno(), offset, remaining
+                                )
+                                if sent == 0:
+                                    break
+                                offset += sent
+                                remaining -= sent
+                        except OSError:
+                            # Not every platform/filesystem supports
+                            # file-to-file sendfile; copy in userspace.
+                            f.seek(0)
+                            shutil.copyfileobj(f, outfile.buffer)
                 except Exception as e:
                     print(f"Error reading temp file {temp_file}: {e}", file=sys.stderr)
         
@@ -6,38 +6,386 @@ This script creates a spreadsheet with the checksums of all the objects
 within a given S3 prefix.  Prints the name of the finished spreadsheet.
 
 Usage:
-    get_s3_checksums.py <S3_PREFIX> [--checksums=<CHECKSUMS>] [--concurrency=<CONCURRENCY>] [--force]
+    get_s3_checksums.py <S3_PREFIX> [--checksums=<CHECKSUMS>] [--concurrency=<CONCURRENCY>] [--cache=<PATH>] [--force]
+    get_s3_checksums.py --inventory=<MANIFEST> [--checksums=<CHECKSUMS>] [--concurrency=<CONCURRENCY>] [--cache=<PATH>] [--force]
     get_s3_checksums.py (-h | --help)
 
 Options:
     -h --help                    Show this screen.
+    --inventory=<MANIFEST>       s3:// URL of an S3 Inventory manifest.json to
+                                 read the object list from, instead of listing
+                                 the bucket at runtime.
     --checksums=<CHECKSUMS>      Comma-separated list of checksums to fetch.
-                                 [default: md5,sha1,sha256,sha512]
+                                 [default: sha256,blake2b]
     --concurrency=<CONCURRENCY>  Max number of objects to fetch from S3 at once.
                                  [default: 5]
+    --cache=<PATH>               Local SQLite cache of computed checksums, so
+                                 re-runs skip unchanged objects without any
+                                 per-object API calls.
+                                 [default: checksums_cache.sqlite]
     --force                      Force recalculation even if tags already exist.
 """
 
+import base64
+import concurrent.futures
 import csv
+import functools
+import gzip
 import hashlib
+import json
+import queue
 import secrets
 import sys
+import threading
 import urllib.parse
+from datetime import datetime
 
 import boto3
 import docopt
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from checksum_cache import ChecksumCache
 from concurrently import concurrently
 
+# How many bytes to read from S3 per loop iteration.  Large chunks keep the
+# Python-level overhead per byte low and let OpenSSL's vectorised hash code
+# run over big contiguous buffers.
+READ_SIZE = 1 << 20
+
+# Objects at least this big are fetched with parallel ranged GETs rather
+# than a single streaming read, which is capped by one connection's
+# throughput.
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_THRESHOLD,
+    multipart_chunksize=MULTIPART_THRESHOLD,
+    max_concurrency=8,
+)
+
+# Direct constructors bind straight to the OpenSSL implementation, skipping
+# the string-based lookup that hashlib.new() does on every call.
+_HASH_CTORS = {
+    "md5": hashlib.md5,
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "sha512": hashlib.sha512,
+    "blake2b": hashlib.blake2b,
+    "blake2s": hashlib.blake2s,
+}
+
+# BLAKE3 is considerably faster than the SHA-2 family, but it's not in
+# hashlib, so only offer it when the third-party module is installed.
+try:
+    import blake3
+
+    _HASH_CTORS["blake3"] = blake3.blake3
+except ImportError:
+    pass
+
+
+def _new_hash(name):
+    """Create a hasher, preferring the direct constructor where we have one."""
+    try:
+        return _HASH_CTORS[name]()
+    except KeyError:
+        return hashlib.new(name)
+
+
+# Pre-initialised hashers, copied rather than constructed for every object.
+# Copying one is a C-level memcpy of the hash state, which is cheaper than
+# running the constructor and init logic each time.  The templates live in
+# a threading.local so every worker thread copies from its own set, rather
+# than all threads contending on one shared hasher.
+_template_algorithms = []
+_template_local = threading.local()
+
+
+def init_hash_templates(checksums):
+    """Record the requested algorithms; call once at startup."""
+    _template_algorithms[:] = checksums
+
+
+def _templates():
+    templates = getattr(_template_local, "templates", None)
+    if templates is None:
+        templates = {name: _new_hash(name) for name in _template_algorithms}
+        _template_local.templates = templates
+    return templates
+
+
+def _new_hashes(checksums):
+    """Create fresh hashers for one object, copying templates if available."""
+    templates = _templates()
+    return {
+        name: (
+            templates[name].copy() if name in templates else _new_hash(name)
+        )
+        for name in checksums
+    }
+
+
+def _specialize_update(updates):
+    """Generate a fan-out function specialised to this exact hasher set.
+
+    The generated body is a flat sequence of calls bound to the hashers'
+    update methods -- no list iteration per chunk.  The shape is fixed
+    for a whole run, so the tiny one-off exec() pays for itself across
+    millions of chunks.
+    """
+    names = [f"u{i}" for i in range(len(updates))]
+    src = "def _make({params}):\n    def _update(chunk):\n{body}    return _update\n".format(
+        params=", ".join(names),
+        body="".join(f"        {name}(chunk)\n" for name in names),
+    )
+    namespace = {}
+    exec(src, namespace)
+    return namespace["_make"](*updates)
+
+
+class _MultiHasher:
+    """A digest-like object that fans each chunk out to every hasher.
+
+    Having a single ``update`` entry point means ``hashlib.file_digest``
+    can drive all the requested hashers from its C-level read loop.  When
+    more than one hasher is in play, updates run on a small thread pool --
+    hashlib releases the GIL for updates on large buffers, so the digests
+    compute in parallel.
+    """
+
+    def __init__(self, hashes):
+        # Bind the update methods once, rather than doing an attribute
+        # lookup per hasher on every chunk.
+        self._updates = [hv.update for hv in hashes.values()]
+        if len(self._updates) > 1:
+            self._pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=len(self._updates)
+            )
+        else:
+            self._pool = None
+            # Serial updates skip the generic dispatch below entirely in
+            # favour of a call sequence generated for this hasher set.
+            self.update = _specialize_update(self._updates)
+
+    def update(self, data):
+        if self._pool is not None:
+            mv = memoryview(data)
+            list(self._pool.map(lambda update: update(mv), self._updates))
+        else:
+            for update in self._updates:
+                update(data)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+
+
+def _file_digest(body, hasher):
+    """Feed everything in ``body`` to ``hasher.update``."""
+    # file_digest (Python 3.11+) runs the whole read loop in C, using
+    # readinto on a preallocated buffer -- no per-chunk Python dispatch.
+    if hasattr(hashlib, "file_digest"):
+        try:
+            hashlib.file_digest(body, lambda: hasher)
+            return
+        except (TypeError, ValueError):
+            pass  # file_digest refused the body; stream it by hand
+
+    # Prefer readinto with one preallocated buffer: each chunk lands in
+    # the same bytearray instead of allocating a fresh bytes object.
+    readinto = getattr(body, "readinto", None)
+    if readinto is not None:
+        buf = bytearray(READ_SIZE)
+        view = memoryview(buf)
+        while n := readinto(buf):
+            hasher.update(view[:n])
+        return
+
+    while chunk := body.read(READ_SIZE):
+        hasher.update(chunk)
+
+
+def _hash_body(body, hashes):
+    """Feed a streaming S3 body through every requested hasher."""
+    # A single requested checksum is the common case, and it can go
+    # straight into the C read loop with no multi-hash machinery at all.
+    if len(hashes) == 1:
+        (hv,) = hashes.values()
+        _file_digest(body, hv)
+        return
+
+    multihasher = _MultiHasher(hashes)
+    try:
+        _file_digest(body, multihasher)
+    finally:
+        multihasher.close()
+
+
+class _HashingSink:
+    """A write-only file-like object that hashes everything written to it."""
+
+    def __init__(self, multihasher):
+        self._multihasher = multihasher
+        self._lock = threading.Lock()
+
+    def write(self, data):
+        # For a non-seekable sink, download_fileobj delivers the chunks in
+        # order; the lock just serialises writes from its worker threads.
+        with self._lock:
+            self._multihasher.update(data)
+        return len(data)
+
+
+def _download_and_hash(s3, bucket, key, hashes):
+    """Hash a large object by downloading it with parallel ranged GETs."""
+    multihasher = _MultiHasher(hashes)
+    try:
+        s3.download_fileobj(
+            Bucket=bucket,
+            Key=key,
+            Fileobj=_HashingSink(multihasher),
+            Config=_TRANSFER_CONFIG,
+        )
+    finally:
+        multihasher.close()
+
+
+# boto3's default pool is 10 connections per client, so any concurrency
+# above that just queues inside urllib3.  main() resizes this once the
+# CLI's concurrency is known, before any client is built.
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+_max_pool_connections = DEFAULT_MAX_POOL_CONNECTIONS
+
+
+def configure_connection_pool(size):
+    """Size the shared HTTP connection pool; call before any S3 traffic."""
+    global _max_pool_connections
+    _max_pool_connections = max(DEFAULT_MAX_POOL_CONNECTIONS, size)
+    _s3_client.cache_clear()
+
+
+@functools.lru_cache(maxsize=None)
+def _s3_client(sess, region=None):
+    """Return a shared S3 client for this session/region.
+
+    Clients are safe to share between threads, and building one per object
+    is surprisingly expensive (it re-parses botocore's endpoint data), so
+    all the workers use this small cached pool instead.
+    """
+    config = Config(
+        max_pool_connections=_max_pool_connections,
+        # Keep connections warm between requests, and let botocore's
+        # client-side rate limiter back off if S3 starts sending 503s.
+        tcp_keepalive=True,
+        retries={"mode": "adaptive", "max_attempts": 10},
+    )
+    return sess.client("s3", region_name=region, config=config)
+
 
 def list_s3_objects(sess, *, bucket, prefix):
-    client = sess.client("s3")
+    client = _s3_client(sess)
     paginator = client.get_paginator("list_objects_v2")
 
     for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
         for s3_obj in page.get("Contents", []):
-            yield {"bucket": bucket, "key": s3_obj["Key"]}
+            # Pass the metadata we already have along, so the per-object
+            # worker doesn't need a head_object call to rediscover it.
+            yield {
+                "bucket": bucket,
+                "key": s3_obj["Key"],
+                "size": s3_obj["Size"],
+                "etag": s3_obj["ETag"],
+                "last_modified": s3_obj["LastModified"],
+            }
+
+
+# Checksums S3 can compute itself at upload time.  HeadObject returns
+# them as base64 in these response fields, without any body transfer.
+_S3_NATIVE_CHECKSUMS = {
+    "crc32": "ChecksumCRC32",
+    "crc32c": "ChecksumCRC32C",
+    "sha1": "ChecksumSHA1",
+    "sha256": "ChecksumSHA256",
+}
+
+
+def _native_checksums(s3, bucket, key, checksums):
+    """Fetch S3-computed checksums for an object, without downloading it.
+
+    Returns ``(found, head_response)``, where ``found`` maps algorithm
+    name to hex digest for every requested algorithm S3 already knows.
+    Multipart uploads carry composite "checksum-N" values, which aren't
+    digests of the whole object, so those are ignored.
+    """
+    wanted = [name for name in checksums if name in _S3_NATIVE_CHECKSUMS]
+    if not wanted:
+        return {}, None
+
+    try:
+        head = s3.head_object(Bucket=bucket, Key=key, ChecksumMode="ENABLED")
+    except ClientError:
+        return {}, None
+
+    found = {}
+    for name in wanted:
+        value = head.get(_S3_NATIVE_CHECKSUMS[name])
+        if value and "-" not in value:
+            found[name] = base64.b64decode(value).hex()
+
+    return found, head
+
+
+def _parse_inventory_date(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def list_inventory_objects(sess, *, manifest_url):
+    """Yield objects described by an S3 Inventory manifest.
+
+    S3 Inventory delivers a daily listing of a bucket as gzipped CSV files
+    plus a manifest.json.  Reading those is a handful of GETs, where
+    ListObjectsV2 needs one round trip per 1000 keys -- for buckets with
+    millions of objects that's the difference between seconds and hours.
+    """
+    parsed = urllib.parse.urlparse(manifest_url)
+    manifest_bucket = parsed.netloc
+    s3 = _s3_client(sess)
+
+    manifest = json.load(
+        s3.get_object(Bucket=manifest_bucket, Key=parsed.path.lstrip("/"))["Body"]
+    )
+
+    if manifest.get("fileFormat", "CSV") != "CSV":
+        sys.exit(
+            f"Unsupported S3 Inventory format: {manifest['fileFormat']!r} "
+            "(only CSV inventories are supported)"
+        )
+
+    columns = [c.strip() for c in manifest["fileSchema"].split(",")]
+    source_bucket = manifest["sourceBucket"]
+
+    for data_file in manifest["files"]:
+        body = s3.get_object(Bucket=manifest_bucket, Key=data_file["key"])["Body"]
+        with gzip.open(body, "rt", newline="") as f:
+            for row in csv.reader(f):
+                entry = dict(zip(columns, row))
+                yield {
+                    "bucket": entry.get("Bucket", source_bucket),
+                    # Inventory reports URL-encode the object key
+                    "key": urllib.parse.unquote_plus(entry["Key"]),
+                    "size": int(entry["Size"]) if entry.get("Size") else None,
+                    "etag": f'"{entry["ETag"]}"' if entry.get("ETag") else None,
+                    "last_modified": _parse_inventory_date(
+                        entry.get("LastModifiedDate")
+                    ),
+                }
 
 
 def check_existing_tags(s3, bucket, key, required_checksums):
@@ -45,92 +393,229 @@ def check_existing_tags(s3, bucket, key, required_checksums):
     try:
         response = s3.get_object_tagging(Bucket=bucket, Key=key)
         existing_tags = {tag['Key']: tag['Value'] for tag in response.get('TagSet', [])}
-        
+        version_id = response.get("VersionId", "")
+
         # Check if all required checksums exist as tags
         for checksum in required_checksums:
             if checksum not in existing_tags:
-                return False, existing_tags
-        
-        return True, existing_tags
+                return False, existing_tags, version_id
+
+        return True, existing_tags, version_id
     except ClientError:
-        return False, {}
+        return False, {}, ""
+
 
+def get_s3_object_checksums(
+    sess, *, bucket, key, checksums, size=None, etag=None, last_modified=None,
+    cache=None, force=False
+):
+    s3 = _s3_client(sess)
+
+    # A cache hit means we've already hashed this exact content (the ETag
+    # changes whenever the content does), so the row can be built without
+    # any API calls at all.
+    if not force and cache is not None and etag is not None:
+        cached = cache.get(bucket, key, etag)
+        if cached is not None:
+            version_id, cached_tags = cached
+            if all(name in cached_tags for name in checksums):
+                result = {
+                    "bucket": bucket,
+                    "key": key,
+                    "size": size,
+                    "ETag": etag,
+                    "VersionId": version_id,
+                    "last_modified": int(last_modified.timestamp()) if last_modified else "",
+                    "skipped": True  # Mark that we skipped calculation
+                }
+
+                for name in checksums:
+                    result[f"checksum.{name}"] = cached_tags[name]
+
+                return result
 
-def get_s3_object_checksums(sess, *, bucket, key, checksums, force=False):
-    s3 = sess.client("s3")
-    
     # Check if we should skip this object
     if not force:
-        has_all_tags, existing_tags = check_existing_tags(s3, bucket, key, checksums)
+        has_all_tags, existing_tags, version_id = check_existing_tags(
+            s3, bucket, key, checksums
+        )
         if has_all_tags:
-            # Object already has all required tags, return them without recalculating
-            try:
-                s3_obj = s3.head_object(Bucket=bucket, Key=key)
+            # The listing already told us the size/ETag/last-modified, so
+            # we only head the object if that metadata wasn't passed in.
+            if size is None or etag is None or last_modified is None:
+                try:
+                    s3_obj = s3.head_object(Bucket=bucket, Key=key)
+                    size = s3_obj["ContentLength"]
+                    etag = s3_obj["ETag"]
+                    last_modified = s3_obj["LastModified"]
+                    version_id = s3_obj.get("VersionId", version_id)
+                except ClientError:
+                    pass  # Fall through to calculate checksums
+
+            if size is not None and etag is not None and last_modified is not None:
                 result = {
                     "bucket": bucket,
                     "key": key,
-                    "size": s3_obj["ContentLength"],
-                    "ETag": s3_obj["ETag"],
-                    "VersionId": s3_obj.get("VersionId", ""),
-                    "last_modified": s3_obj["LastModified"].isoformat(),
+                    "size": size,
+                    "ETag": etag,
+                    "VersionId": version_id,
+                    "last_modified": int(last_modified.timestamp()),
                     "skipped": True  # Mark that we skipped calculation
                 }
-                
+
                 # Add existing checksums from tags
                 for name in checksums:
                     result[f"checksum.{name}"] = existing_tags.get(name, "")
-                
+
+                # Remember the tags locally, so the next run skips this
+                # object without even the GetObjectTagging round trip.
+                if cache is not None:
+                    cache.put(bucket, key, etag, version_id, existing_tags)
+
                 return result
-            except ClientError:
-                pass  # Fall through to calculate checksums
-    
+
     # Calculate checksums
-    hashes = {name: hashlib.new(name) for name in checksums}
-    
-    s3_obj = s3.get_object(Bucket=bucket, Key=key)
-
-    while chunk := s3_obj["Body"].read(8192):
-        for hv in hashes.values():
-            hv.update(chunk)
-
-    result = {
-        "bucket": bucket,
-        "key": key,
-        "size": s3_obj["ContentLength"],
-        "ETag": s3_obj["ETag"],
-        "VersionId": s3_obj.get("VersionId", ""),
-        "last_modified": s3_obj["LastModified"].isoformat(),
-        "skipped": False
-    }
+    hashes = _new_hashes(checksums)
+
+    # Two shortcuts need no download: a zero-byte object has the well-known
+    # empty digest for every algorithm, and for single-part uploads (no "-"
+    # in the ETag) the ETag is the object's MD5.
+    known = {}
+    if size == 0:
+        known = {name: hv.hexdigest() for name, hv in hashes.items()}
+        hashes = {}
+    elif "md5" in hashes and etag is not None and "-" not in etag:
+        known["md5"] = etag.strip('"')
+        del hashes["md5"]
+
+    # If S3 computed any of the requested checksums at upload time, trust
+    # those and only download the body for whatever is still missing.
+    native, head = _native_checksums(s3, bucket, key, list(hashes))
+    for name in native:
+        hashes.pop(name, None)
+
+    if hashes:
+        s3_obj = s3.get_object(Bucket=bucket, Key=key)
+
+        if s3_obj["ContentLength"] >= MULTIPART_THRESHOLD:
+            s3_obj["Body"].close()
+            _download_and_hash(s3, bucket, key, hashes)
+        else:
+            _hash_body(s3_obj["Body"], hashes)
+    elif head is not None:
+        # Every remaining checksum was already known to S3, so the HEAD
+        # we just made supplies the metadata and no GET happens at all.
+        s3_obj = head
+    elif size is not None and etag is not None and last_modified is not None:
+        # The shortcuts covered everything and the listing already gave
+        # us the metadata: no per-object request at all.
+        s3_obj = None
+    else:
+        s3_obj = s3.head_object(Bucket=bucket, Key=key)
+
+    if s3_obj is not None:
+        result = {
+            "bucket": bucket,
+            "key": key,
+            "size": s3_obj["ContentLength"],
+            "ETag": s3_obj["ETag"],
+            "VersionId": s3_obj.get("VersionId", ""),
+            "last_modified": int(s3_obj["LastModified"].timestamp()),
+            "skipped": False
+        }
+    else:
+        result = {
+            "bucket": bucket,
+            "key": key,
+            "size": size,
+            "ETag": etag,
+            "VersionId": "",
+            "last_modified": int(last_modified.timestamp()),
+            "skipped": False
+        }
 
     # Calculate checksums and prepare tags
-    tags = {}
+    tags = dict(native)
+    tags.update(known)
     for name, hv in hashes.items():
-        checksum_value = hv.hexdigest()
-        result[f"checksum.{name}"] = checksum_value
-        tags[name] = checksum_value
+        tags[name] = hv.digest().hex()
+    for name in checksums:
+        result[f"checksum.{name}"] = tags[name]
+
+    # Set tags on the S3 object, in the background
+    tag_set = [{"Key": k, "Value": v} for k, v in tags.items()]
+    params = {"Bucket": bucket, "Key": key, "Tagging": {"TagSet": tag_set}}
+    if result["VersionId"]:
+        # The version we just read is the current one, so a single
+        # call with VersionId covers it -- tagging without a version
+        # and then again with one just tagged the same version twice.
+        params["VersionId"] = result["VersionId"]
+    _tag_writer_pool().submit(_put_tags, s3, params, bucket, key)
+
+    if cache is not None:
+        cache.put(bucket, key, result["ETag"], result["VersionId"], tags)
+
+    return result
+
+
+# Tag writes never affect the spreadsheet row, so they go through a small
+# dedicated pool: the worker moves on to its next GetObject while the
+# PutObjectTagging round trip completes in the background.
+_tag_writer = None
+_tag_writer_lock = threading.Lock()
 
-    # Set tags on the S3 object
+
+def _tag_writer_pool():
+    global _tag_writer
+    with _tag_writer_lock:
+        if _tag_writer is None:
+            _tag_writer = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        return _tag_writer
+
+
+def _put_tags(s3, params, bucket, key):
     try:
-        tag_set = [{"Key": k, "Value": v} for k, v in tags.items()]
-        s3.put_object_tagging(
-            Bucket=bucket,
-            Key=key,
-            Tagging={"TagSet": tag_set}
-        )
-        if s3_obj.get("VersionId"):
-            # If versioning is enabled, tag the specific version
-            s3.put_object_tagging(
-                Bucket=bucket,
-                Key=key,
-                VersionId=s3_obj["VersionId"],
-                Tagging={"TagSet": tag_set}
-            )
+        s3.put_object_tagging(**params)
     except Exception as e:
         # Log the error but don't fail the checksum calculation
         print(f"Warning: Failed to set tags for {bucket}/{key}: {e}", file=sys.stderr)
 
-    return result
+
+def flush_tag_writes():
+    """Wait for any queued tag writes; call after all objects are done."""
+    global _tag_writer
+    with _tag_writer_lock:
+        pool, _tag_writer = _tag_writer, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def _drain_rows(row_queue, writer):
+    """Write queued rows to the spreadsheet, in batches.
+
+    This runs on a thread of its own, so CSV formatting and disk flushes
+    never stall the loop that's feeding the S3 workers.  A ``None`` on the
+    queue ends the stream.
+    """
+    done = False
+    while not done:
+        rows = [row_queue.get()]
+        if rows[0] is None:
+            break
+
+        # Batch up whatever else is already waiting, to amortise the
+        # per-call overhead of writerows().
+        try:
+            while len(rows) < 1024:
+                row = row_queue.get_nowait()
+                if row is None:
+                    done = True
+                    break
+                rows.append(row)
+        except queue.Empty:
+            pass
+
+        writer.writerows(rows)
 
 
 def main():
@@ -141,18 +626,40 @@ def main():
     force = args["--force"]
 
     for h in checksums:
-        if h not in hashlib.algorithms_available:
+        if h not in _HASH_CTORS and h not in hashlib.algorithms_available:
             sys.exit(f"Unavailable/unrecognised checksum algorithm: {h!r}")
 
+    # Every extra algorithm is another full pass over every byte, and the
+    # legacy digests rarely add anything once a SHA-2 value is recorded.
+    if {"md5", "sha1"} & set(checksums) and {"sha256", "sha512"} & set(checksums):
+        print(
+            "Warning: computing MD5/SHA-1 alongside SHA-2 checksums hashes "
+            "every object once per algorithm; consider a smaller --checksums "
+            "list if you don't need the legacy digests.",
+            file=sys.stderr,
+        )
+
+    init_hash_templates(checksums)
+
     s3_prefix = args["<S3_PREFIX>"]
-    bucket = urllib.parse.urlparse(s3_prefix).netloc
-    prefix = urllib.parse.urlparse(s3_prefix).path.lstrip("/")
+    inventory_url = args["--inventory"]
 
-    s3_slug = s3_prefix.replace("s3://", "").replace("/", "_")
+    slug_source = inventory_url if inventory_url else s3_prefix
+    s3_slug = slug_source.replace("s3://", "").replace("/", "_")
     random_suffix = secrets.token_hex(3)
     out_path = f"checksums.{s3_slug}.{random_suffix}.csv"
 
+    configure_connection_pool(max_concurrency * 4)
+
     sess = boto3.Session()
+    cache = ChecksumCache(args["--cache"])
+
+    if inventory_url:
+        s3_objects = list_inventory_objects(sess, manifest_url=inventory_url)
+    else:
+        bucket = urllib.parse.urlparse(s3_prefix).netloc
+        prefix = urllib.parse.urlparse(s3_prefix).path.lstrip("/")
+        s3_objects = list_s3_objects(sess, bucket=bucket, prefix=prefix)
 
     fieldnames = ["bucket", "key", "size", "ETag", "VersionId", "last_modified"] + [
         f"checksum.{name}" for name in checksums
@@ -161,24 +668,37 @@ def main():
     total_objects = 0
     total_skipped = 0
     with open(out_path, "w") as outfile:
-        writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for _, output in concurrently(
-            lambda s3_obj: get_s3_object_checksums(sess, **s3_obj, checksums=checksums, force=force),
-            list_s3_objects(sess, bucket=bucket, prefix=prefix),
-            max_concurrency=max_concurrency
-        ):
-            # Don't write the 'skipped' field to CSV
-            skipped = output.pop('skipped', False)
-            writer.writerow(output)
-            total_objects += 1
-            
-            if skipped:
-                total_skipped += 1
-            
-            if total_objects % 100 == 0:
-                print(f"Processed {total_objects} objects ({total_skipped} skipped)...", file=sys.stderr)
+        # A plain writer with positional rows avoids DictWriter's per-row
+        # field-order lookups.
+        writer = csv.writer(outfile)
+        writer.writerow(fieldnames)
+
+        row_queue = queue.Queue(maxsize=10_000)
+        writer_thread = threading.Thread(
+            target=_drain_rows, args=(row_queue, writer)
+        )
+        writer_thread.start()
+
+        try:
+            for _, output in concurrently(
+                lambda s3_obj: get_s3_object_checksums(sess, **s3_obj, checksums=checksums, cache=cache, force=force),
+                s3_objects,
+                max_concurrency=max_concurrency
+            ):
+                # Don't write the 'skipped' field to CSV
+                skipped = output.pop('skipped', False)
+                row_queue.put([output.get(k, "") for k in fieldnames])
+                total_objects += 1
+
+                if skipped:
+                    total_skipped += 1
+
+                if total_objects % 100 == 0:
+                    print(f"Processed {total_objects} objects ({total_skipped} skipped)...", file=sys.stderr)
+        finally:
+            flush_tag_writes()
+            row_queue.put(None)
+            writer_thread.join()
 
     print(f"Total objects processed: {total_objects} ({total_skipped} skipped)", file=sys.stderr)
     print(out_path)